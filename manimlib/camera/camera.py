@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import defaultdict
 import itertools as it
 import math
 
@@ -20,7 +21,10 @@ from manimlib.mobject.mobject import Point
 from manimlib.utils.color import color_to_rgba
 from manimlib.utils.config_ops import digest_config
 from manimlib.utils.simple_functions import fdiv
+from manimlib.utils.space_ops import get_norm
 from manimlib.utils.space_ops import normalize
+from manimlib.utils.space_ops import quaternion_mult
+from manimlib.utils.space_ops import rotation_matrix_transpose_from_quaternion
 
 from typing import TYPE_CHECKING
 
@@ -41,6 +45,7 @@ class CameraFrame(Mobject):
         # As a quaternion
         self.uniforms["orientation"] = Rotation.identity().as_quat()
         self.uniforms["focal_dist_to_height"] = self.focal_dist_to_height
+        self.orientation_key: bytes | None = None
 
     def init_points(self) -> None:
         self.set_points([ORIGIN, LEFT, RIGHT, DOWN, UP])
@@ -93,12 +98,45 @@ class CameraFrame(Mobject):
         '''
         return self.get_euler_angles()[2]
 
+    def refresh_rotation_matrix(self) -> None:
+        '''
+        根据四元数更新相机旋转矩阵，四元数未变化时跳过计算
+        '''
+        orientation = self.uniforms["orientation"]
+        key = orientation.tobytes()
+        if key == self.orientation_key:
+            return
+        # A new, C-contiguous array each time, never modified in place,
+        # since copies of the frame share it
+        self.camera_rotation_matrix = rotation_matrix_transpose_from_quaternion(
+            orientation.tolist()
+        )
+        # Transpose is the inverse for a rotation
+        self.inverse_camera_rotation_matrix = self.camera_rotation_matrix.T
+        self.orientation_key = key
+
+    def get_camera_rotation_matrix(self):
+        self.refresh_rotation_matrix()
+        return self.camera_rotation_matrix
+
     def get_inverse_camera_rotation_matrix(self):
-        return self.get_orientation().as_matrix().T
+        self.refresh_rotation_matrix()
+        return self.inverse_camera_rotation_matrix
 
     def rotate(self, angle: float, axis: np.ndarray = OUT, **kwargs):
-        rot = Rotation.from_rotvec(angle * normalize(axis))
-        self.set_orientation(rot * self.get_orientation())
+        if get_norm(axis) == 0:
+            # No axis means no rotation
+            return self
+        return self.rotate_about_unit_axis(angle, normalize(axis))
+
+    def rotate_about_unit_axis(self, angle: float, axis: np.ndarray):
+        '''
+        绕单位向量 ``axis`` 旋转相机，直接复合四元数而不归一化轴
+        '''
+        s = math.sin(angle / 2)
+        delta = [s * axis[0], s * axis[1], s * axis[2], math.cos(angle / 2)]
+        orientation = self.uniforms["orientation"]
+        orientation[:] = quaternion_mult(delta, orientation)
         return self
 
     def set_euler_angles(
@@ -152,21 +190,21 @@ class CameraFrame(Mobject):
         '''
         增加相机的欧拉角的 theta 值
         '''
-        self.rotate(dtheta, OUT)
+        self.rotate_about_unit_axis(dtheta, OUT)
         return self
 
     def increment_phi(self, dphi: float):
         '''
         增加相机的欧拉角的 phi 值
         '''
-        self.rotate(dphi, self.get_inverse_camera_rotation_matrix()[0])
+        self.rotate_about_unit_axis(dphi, self.get_inverse_camera_rotation_matrix()[0])
         return self
 
     def increment_gamma(self, dgamma: float):
         '''
         增加相机的欧拉角的 gamma 值
         '''
-        self.rotate(dgamma, self.get_inverse_camera_rotation_matrix()[2])
+        self.rotate_about_unit_axis(dgamma, self.get_inverse_camera_rotation_matrix()[2])
         return self
 
     def set_focal_distance(self, focal_distance: float):
@@ -229,6 +267,11 @@ class CameraFrame(Mobject):
         return self.get_center() + dist * to_camera
 
 
+# Uniform buffer binding point of the CameraUniforms block
+# declared in camera_uniform_declarations.glsl
+CAMERA_UNIFORMS_BINDING = 0
+
+
 class Camera(object):
     '''
     摄像机
@@ -269,14 +312,17 @@ class Camera(object):
         '''
         digest_config(self, kwargs, locals())
         self.rgb_max_val: float = np.iinfo(self.pixel_array_dtype).max
-        self.background_rgba: list[float] = list(color_to_rgba(
+        # Plain python floats, so clear() passes them on without conversion
+        self.background_rgba: tuple[float, ...] = tuple(color_to_rgba(
             self.background_color, self.background_opacity
-        ))
+        ).tolist())
         self.init_frame()
         self.init_context(ctx)
         self.init_shaders()
         self.init_textures()
+        self.init_render_group_pool()
         self.init_light_source()
+        self.init_perspective_uniforms_buffer()
         self.refresh_perspective_uniforms()
         # A cached map from mobjects to their associated list of render groups
         # so that these render groups are not regenerated unnecessarily for static
@@ -296,14 +342,23 @@ class Camera(object):
         if ctx is None:
             ctx = moderngl.create_standalone_context()
             fbo = self.get_fbo(ctx, 0)
+            # An offscreen fbo without multisampling can be drawn to
+            # directly, with no need to blit into it afterwards
+            self.needs_msaa_blit = self.samples > 0
         else:
             fbo = ctx.detect_framebuffer()
+            self.needs_msaa_blit = True
         self.ctx = ctx
         self.fbo = fbo
         self.set_ctx_blending()
+        # Last depth test state set on the context, None when unknown
+        self.depth_test_enabled: bool | None = None
 
         # For multisample antialiasing
-        fbo_msaa = self.get_fbo(ctx, self.samples)
+        if self.needs_msaa_blit:
+            fbo_msaa = self.get_fbo(ctx, self.samples)
+        else:
+            fbo_msaa = fbo
         fbo_msaa.use()
         self.fbo_msaa = fbo_msaa
 
@@ -328,6 +383,7 @@ class Camera(object):
             self.ctx.enable(moderngl.DEPTH_TEST)
         else:
             self.ctx.disable(moderngl.DEPTH_TEST)
+        self.depth_test_enabled = enable
 
     def init_light_source(self) -> None:
         self.light_source = Point(self.light_source_position)
@@ -356,7 +412,8 @@ class Camera(object):
     def clear(self) -> None:
         '''清空帧缓冲'''
         self.fbo.clear(*self.background_rgba)
-        self.fbo_msaa.clear(*self.background_rgba)
+        if self.needs_msaa_blit:
+            self.fbo_msaa.clear(*self.background_rgba)
 
     def reset_pixel_shape(self, new_width: int, new_height: int) -> None:
         '''重置像素宽高'''
@@ -364,13 +421,18 @@ class Camera(object):
         self.pixel_height = new_height
         self.refresh_perspective_uniforms()
 
+    def blit_fbo_msaa(self) -> None:
+        '''将 fbo_msaa 中的内容复制到 fbo，以便读取'''
+        if self.needs_msaa_blit:
+            # Copy blocks from the fbo_msaa to the drawn fbo using Blit
+            pw, ph = (self.pixel_width, self.pixel_height)
+            gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, self.fbo_msaa.glo)
+            gl.glBindFramebuffer(gl.GL_DRAW_FRAMEBUFFER, self.fbo.glo)
+            gl.glBlitFramebuffer(0, 0, pw, ph, 0, 0, pw, ph, gl.GL_COLOR_BUFFER_BIT, gl.GL_LINEAR)
+
     def get_raw_fbo_data(self, dtype: str = 'f1') -> bytes:
         '''获取源缓冲数据'''
-        # Copy blocks from the fbo_msaa to the drawn fbo using Blit
-        pw, ph = (self.pixel_width, self.pixel_height)
-        gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, self.fbo_msaa.glo)
-        gl.glBindFramebuffer(gl.GL_DRAW_FRAMEBUFFER, self.fbo.glo)
-        gl.glBlitFramebuffer(0, 0, pw, ph, 0, 0, pw, ph, gl.GL_COLOR_BUFFER_BIT, gl.GL_LINEAR)
+        self.blit_fbo_msaa()
         return self.fbo.read(
             viewport=self.fbo.viewport,
             components=self.n_channels,
@@ -388,6 +450,20 @@ class Camera(object):
 
     def get_pixel_array(self) -> np.ndarray:
         '''获取当前帧 RGB 像素矩阵'''
+        if np.dtype(self.pixel_array_dtype) == np.uint8:
+            # Let the GPU do the float to byte conversion during readback,
+            # reading into a bytearray so that the result stays writable
+            self.blit_fbo_msaa()
+            viewport = self.fbo.viewport
+            raw = bytearray(viewport[2] * viewport[3] * self.n_channels)
+            self.fbo.read_into(
+                raw,
+                viewport=viewport,
+                components=self.n_channels,
+                dtype='f1',
+            )
+            flat_arr = np.frombuffer(raw, dtype=np.uint8)
+            return flat_arr.reshape([*self.fbo.size, self.n_channels])
         raw = self.get_raw_fbo_data(dtype='f4')
         flat_arr = np.frombuffer(raw, dtype='f4')
         arr = flat_arr.reshape([*self.fbo.size, self.n_channels])
@@ -463,16 +539,33 @@ class Camera(object):
     def capture(self, *mobjects: Mobject, **kwargs) -> None:
         '''捕获 mobjects 中的物体'''
         self.refresh_perspective_uniforms()
+        # Something other than the camera may have touched the
+        # context between frames, so resync depth testing once
+        self.depth_test_enabled = None
         for mobject in mobjects:
             for render_group in self.get_render_group_list(mobject):
                 self.render(render_group)
+        self.flush_render_group_pool()
 
     def render(self, render_group: dict[str]) -> None:
         '''渲染'''
         shader_wrapper = render_group["shader_wrapper"]
         shader_program = render_group["prog"]
-        self.set_shader_uniforms(shader_program, shader_wrapper)
-        self.set_ctx_depth_test(shader_wrapper.depth_test)
+        # Uniforms stay set on a program between draws, so a static render
+        # group which was also the last to set them need not set them again.
+        # Programs with loose camera uniforms need them reset as the camera moves.
+        sid = shader_wrapper.get_program_id()
+        if any((
+            render_group["single_use"],
+            not self.id_to_uses_camera_block[sid],
+            self.id_to_uniforms_owner.get(sid) is not render_group,
+        )):
+            self.set_shader_uniforms(shader_program, shader_wrapper)
+            self.id_to_uniforms_owner[sid] = None if render_group["single_use"] else render_group
+        # Consecutive render groups usually share the same depth test
+        # setting, so only switch it when it actually changes
+        if shader_wrapper.depth_test != self.depth_test_enabled:
+            self.set_ctx_depth_test(shader_wrapper.depth_test)
         render_group["vao"].render(int(shader_wrapper.render_primitive))
         if render_group["single_use"]:
             self.release_render_group(render_group)
@@ -507,24 +600,47 @@ class Camera(object):
         - ``shader_wrapper`` : 材质包装
         - ``single_use`` : 单次使用
         '''
-        # Data buffers
-        vbo = self.ctx.buffer(shader_wrapper.vert_data.tobytes())
-        if shader_wrapper.vert_indices is None:
-            ibo = None
-        else:
-            vert_index_data = shader_wrapper.vert_indices.astype('i4').tobytes()
-            if vert_index_data:
-                ibo = self.ctx.buffer(vert_index_data)
-            else:
-                ibo = None
+        # Data, passed to the context through the buffer protocol
+        # so that no intermediate bytes copy is made
+        vert_data = np.ascontiguousarray(shader_wrapper.vert_data)
+        vert_index_data = None
+        if shader_wrapper.vert_indices is not None:
+            vert_index_data = np.ascontiguousarray(
+                shader_wrapper.vert_indices, dtype='i4'
+            )
+            if vert_index_data.size == 0:
+                vert_index_data = None
 
-        # Program and vertex array
         shader_program, vert_format = self.get_shader_program(shader_wrapper)
-        vao = self.ctx.vertex_array(
-            program=shader_program,
-            content=[(vbo, vert_format, *shader_wrapper.vert_attributes)],
-            index_buffer=ibo,
+        pool_key = (
+            shader_wrapper.get_program_id(),
+            shader_wrapper.vert_attributes,
+            vert_data.nbytes,
+            0 if vert_index_data is None else vert_index_data.nbytes,
         )
+        pooled = self.pop_pooled_render_group(pool_key)
+        if pooled is not None:
+            # Orphan before writing so the driver need not wait on
+            # draws still using the old contents
+            vbo, ibo, vao = pooled
+            vbo.orphan()
+            vbo.write(vert_data)
+            if ibo is not None:
+                ibo.orphan()
+                ibo.write(vert_index_data)
+        else:
+            # Data buffers
+            vbo = self.ctx.buffer(vert_data)
+            if vert_index_data is None:
+                ibo = None
+            else:
+                ibo = self.ctx.buffer(vert_index_data)
+            # Vertex array
+            vao = self.ctx.vertex_array(
+                program=shader_program,
+                content=[(vbo, vert_format, *shader_wrapper.vert_attributes)],
+                index_buffer=ibo,
+            )
         return {
             "vbo": vbo,
             "ibo": ibo,
@@ -532,18 +648,44 @@ class Camera(object):
             "prog": shader_program,
             "shader_wrapper": shader_wrapper,
             "single_use": single_use,
+            "pool_key": pool_key,
         }
 
     def release_render_group(self, render_group: dict[str]) -> None:
-        '''释放渲染'''
-        for key in ["vbo", "ibo", "vao"]:
-            if render_group[key] is not None:
-                render_group[key].release()
+        '''释放渲染，其中的缓冲会放回缓冲池以便复用'''
+        self.render_group_pool[render_group["pool_key"]].append(
+            (render_group["vbo"], render_group["ibo"], render_group["vao"])
+        )
+
+    # Pool of released buffers and vertex arrays
+    def init_render_group_pool(self) -> None:
+        # Both map (program id, attributes, vbo size, ibo size) to lists of
+        # (vbo, ibo, vao) triples.  Anything released during the previous
+        # capture stays available for one more capture before being freed,
+        # so mobjects redrawn every frame keep reusing the same GL objects.
+        self.render_group_pool: dict[tuple, list[tuple]] = defaultdict(list)
+        self.previous_render_group_pool: dict[tuple, list[tuple]] = defaultdict(list)
+
+    def pop_pooled_render_group(self, pool_key: tuple) -> tuple | None:
+        for pool in (self.previous_render_group_pool, self.render_group_pool):
+            if pool.get(pool_key):
+                return pool[pool_key].pop()
+        return None
+
+    def flush_render_group_pool(self) -> None:
+        '''释放上一帧留下但未被复用的缓冲'''
+        for gl_objects in it.chain(*self.previous_render_group_pool.values()):
+            for obj in gl_objects:
+                if obj is not None:
+                    obj.release()
+        self.previous_render_group_pool = self.render_group_pool
+        self.render_group_pool = defaultdict(list)
 
     def refresh_static_mobjects(self) -> None:
         for render_group in it.chain(*self.mob_to_render_groups.values()):
             self.release_render_group(render_group)
         self.mob_to_render_groups = {}
+        self.id_to_uniforms_owner = {}
 
     # Shaders
     def init_shaders(self) -> None:
@@ -551,6 +693,13 @@ class Camera(object):
         self.id_to_shader_program: dict[
             int | str, tuple[moderngl.Program, str] | None
         ] = {"": None}
+        # Uniform handles of each program, resolved once at creation
+        self.id_to_uniforms: dict[int | str, dict[str, moderngl.Uniform]] = {}
+        # Whether each program reads camera uniforms from the CameraUniforms
+        # block, rather than declaring them as plain uniforms
+        self.id_to_uses_camera_block: dict[int | str, bool] = {}
+        # Static render group whose uniforms each program currently holds
+        self.id_to_uniforms_owner: dict[int | str, dict[str] | None] = {}
 
     def get_shader_program(
         self,
@@ -563,6 +712,15 @@ class Camera(object):
             program = self.ctx.program(**shader_wrapper.get_program_code())
             vert_format = moderngl.detect_format(program, shader_wrapper.vert_attributes)
             self.id_to_shader_program[sid] = (program, vert_format)
+            camera_uniforms = program.get("CameraUniforms", None)
+            if camera_uniforms is not None:
+                camera_uniforms.binding = CAMERA_UNIFORMS_BINDING
+            self.id_to_uses_camera_block[sid] = camera_uniforms is not None
+            self.id_to_uniforms[sid] = {
+                name: program[name]
+                for name in program
+                if isinstance(program[name], moderngl.Uniform)
+            }
         return self.id_to_shader_program[sid]
 
     def set_shader_uniforms(
@@ -574,16 +732,51 @@ class Camera(object):
         for name, path in shader_wrapper.texture_paths.items():
             tid = self.get_texture_id(path)
             shader[name].value = tid
-        for name, value in it.chain(self.perspective_uniforms.items(), shader_wrapper.uniforms.items()):
-            try:
-                if isinstance(value, np.ndarray) and value.ndim > 0:
-                    value = tuple(value)
-                shader[name].value = value
-            except KeyError:
-                pass
+        sid = shader_wrapper.get_program_id()
+        uniforms = self.id_to_uniforms[sid]
+        if self.id_to_uses_camera_block[sid]:
+            # Perspective uniforms live in the shared uniform buffer, so only
+            # those specific to this shader wrapper are set here
+            items = shader_wrapper.uniforms.items()
+        else:
+            # Shaders declaring the camera uniforms loosely, as older custom
+            # shaders may, still get them set on every draw
+            items = it.chain(
+                self.loose_perspective_uniforms.items(),
+                shader_wrapper.uniforms.items(),
+            )
+        for name, value in items:
+            uniform = uniforms.get(name)
+            if uniform is None:
+                continue
+            if isinstance(value, np.ndarray) and value.ndim > 0:
+                value = tuple(value)
+            uniform.value = value
+
+    def init_perspective_uniforms_buffer(self) -> None:
+        # 7 rows of 4 floats, see write_perspective_uniforms_buffer
+        self.perspective_uniforms_buffer = self.ctx.buffer(reserve=7 * 4 * 4)
+        self.perspective_uniforms_buffer.bind_to_uniform_block(CAMERA_UNIFORMS_BINDING)
+        self.perspective_uniforms_key = None
+
+    def get_perspective_uniforms_key(self) -> tuple:
+        '''获取透视变量所依赖的全部状态，用于判断是否需要更新'''
+        frame = self.frame
+        return (
+            frame.get_points().tobytes(),
+            frame.uniforms["orientation"].tobytes(),
+            float(frame.uniforms["focal_dist_to_height"]),
+            self.light_source.get_points().tobytes(),
+            tuple(self.get_pixel_shape()),
+            self.anti_alias_width,
+        )
 
     def refresh_perspective_uniforms(self) -> None:
-        '''更新透视变量'''
+        '''更新透视变量，相机状态未变化时跳过'''
+        key = self.get_perspective_uniforms_key()
+        if key == self.perspective_uniforms_key:
+            return
+        self.perspective_uniforms_key = key
         frame = self.frame
         pw, ph = self.get_pixel_shape()
         fw, fh = frame.get_shape()
@@ -592,22 +785,52 @@ class Camera(object):
         anti_alias_width = self.anti_alias_width / (ph / fh)
         # Orient light
         rotation = frame.get_inverse_camera_rotation_matrix()
-        offset = frame.get_center()
+        offset = frame.get_center().copy()
         light_pos = np.dot(
             rotation, self.light_source.get_location() + offset
         )
         cam_pos = self.frame.get_implied_camera_location()  # TODO
 
         self.perspective_uniforms = {
-            "frame_shape": frame.get_shape(),
+            "frame_shape": (fw, fh),
+            "anti_alias_width": anti_alias_width,
+            "camera_offset": offset,
+            "camera_rotation": frame.get_camera_rotation_matrix(),
+            "camera_position": cam_pos,
+            "light_source_position": light_pos,
+            "focal_distance": frame.get_focal_distance(),
+        }
+        self.write_perspective_uniforms_buffer()
+        # Same values in the form plain uniforms expect, for shaders
+        # not using the CameraUniforms block
+        self.loose_perspective_uniforms = {
+            "frame_shape": (fw, fh),
             "anti_alias_width": anti_alias_width,
             "camera_offset": tuple(offset),
-            "camera_rotation": tuple(np.array(rotation).T.flatten()),
+            "camera_rotation": tuple(frame.get_camera_rotation_matrix().ravel()),
             "camera_position": tuple(cam_pos),
             "light_source_position": tuple(light_pos),
             "focal_distance": frame.get_focal_distance(),
         }
 
+    def write_perspective_uniforms_buffer(self) -> None:
+        '''将透视变量按 std140 布局写入共享的 uniform 缓冲'''
+        uniforms = self.perspective_uniforms
+        # Under std140, vec3 and each column of a mat3 are padded to 4 floats
+        data = np.zeros((7, 4), dtype='f4')
+        data[0] = [
+            *uniforms["frame_shape"],
+            uniforms["anti_alias_width"],
+            uniforms["focal_distance"],
+        ]
+        data[1, :3] = uniforms["camera_offset"]
+        # GLSL matrices are column major, so the rows written here become
+        # the columns of camera_rotation, i.e. the shader gets the inverse
+        data[2:5, :3] = uniforms["camera_rotation"]
+        data[5, :3] = uniforms["camera_position"]
+        data[6, :3] = uniforms["light_source_position"]
+        self.perspective_uniforms_buffer.write(data)
+
     def init_textures(self) -> None:
         self.n_textures: int = 0
         self.path_to_texture: dict[
@@ -621,12 +844,17 @@ class Camera(object):
                 self.n_textures += 1
             tid = self.n_textures
             self.n_textures += 1
-            im = Image.open(path).convert("RGBA")
+            im = Image.open(path)
+            if im.mode != "RGBA":
+                im = im.convert("RGBA")
             texture = self.ctx.texture(
                 size=im.size,
                 components=len(im.getbands()),
                 data=im.tobytes(),
             )
+            # Shaders sample with plain linear filtering, so no
+            # mipmaps are built for these textures
+            texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
             texture.use(location=tid)
             self.path_to_texture[path] = (tid, texture)
         return self.path_to_texture[path][0]
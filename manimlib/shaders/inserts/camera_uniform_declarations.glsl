@@ -1,6 +1,13 @@
-uniform vec2 frame_shape;
-uniform float anti_alias_width;
-uniform vec3 camera_offset;
-uniform mat3 camera_rotation;
+// Shared by every shader program, and rewritten by the camera
+// only when its state changes.  The layout here must match the
+// one packed in Camera.write_perspective_uniforms_buffer
+layout(std140) uniform CameraUniforms {
+    vec2 frame_shape;
+    float anti_alias_width;
+    float focal_distance;
+    vec3 camera_offset;
+    mat3 camera_rotation;
+    vec3 camera_position;
+    vec3 light_source_position;
+};
 uniform float is_fixed_in_frame;
-uniform float focal_distance;
\ No newline at end of file
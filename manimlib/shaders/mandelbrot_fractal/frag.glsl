@@ -1,11 +1,9 @@
 #version 330
 
-uniform vec3 light_source_position;
-uniform vec3 camera_position;
+#INSERT camera_uniform_declarations.glsl
 uniform float reflectiveness;
 uniform float gloss;
 uniform float shadow;
-uniform float focal_distance;
 
 uniform vec2 parameter;
 uniform float opacity;
@@ -22,8 +20,6 @@ uniform vec3 color6;
 uniform vec3 color7;
 uniform vec3 color8;
 
-uniform vec2 frame_shape;
-
 in vec3 xyz_coords;
 
 out vec4 frag_color;
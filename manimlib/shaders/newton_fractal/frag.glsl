@@ -1,11 +1,9 @@
 #version 330
 
-uniform vec3 light_source_position;
-uniform vec3 camera_position;
+#INSERT camera_uniform_declarations.glsl
 uniform float reflectiveness;
 uniform float gloss;
 uniform float shadow;
-uniform float focal_distance;
 
 uniform vec4 color0;
 uniform vec4 color1;
@@ -33,8 +31,6 @@ uniform float saturation_factor;
 uniform float black_for_cycles;
 uniform float is_parameter_space;
 
-uniform vec2 frame_shape;
-
 in vec3 xyz_coords;
 
 out vec4 frag_color;
@@ -3,15 +3,10 @@
 layout (triangles) in;
 layout (triangle_strip, max_vertices = 5) out;
 
-uniform float anti_alias_width;
+// Needed for get_gl_Position and finalize_color
+#INSERT camera_uniform_declarations.glsl
 
-// Needed for get_gl_Position
-uniform vec2 frame_shape;
-uniform float focal_distance;
-uniform float is_fixed_in_frame;
 // Needed for finalize_color
-uniform vec3 light_source_position;
-uniform vec3 camera_position;
 uniform float reflectiveness;
 uniform float gloss;
 uniform float shadow;
@@ -3,17 +3,12 @@
 layout (triangles) in;
 layout (triangle_strip, max_vertices = 5) out;
 
-// Needed for get_gl_Position
-uniform vec2 frame_shape;
-uniform float focal_distance;
-uniform float is_fixed_in_frame;
+// Needed for get_gl_Position and lighting
+#INSERT camera_uniform_declarations.glsl
 
-uniform float anti_alias_width;
 uniform float flat_stroke;
 
 //Needed for lighting
-uniform vec3 light_source_position;
-uniform vec3 camera_position;
 uniform float joint_type;
 uniform float reflectiveness;
 uniform float gloss;
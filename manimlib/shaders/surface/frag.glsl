@@ -1,11 +1,9 @@
 #version 330
 
-uniform vec3 light_source_position;
-uniform vec3 camera_position;
+#INSERT camera_uniform_declarations.glsl
 uniform float reflectiveness;
 uniform float gloss;
 uniform float shadow;
-uniform float focal_distance;
 
 in vec3 xyz_coords;
 in vec3 v_normal;
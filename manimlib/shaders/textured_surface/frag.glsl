@@ -3,12 +3,10 @@
 uniform sampler2D LightTexture;
 uniform sampler2D DarkTexture;
 uniform float num_textures;
-uniform vec3 light_source_position;
-uniform vec3 camera_position;
+#INSERT camera_uniform_declarations.glsl
 uniform float reflectiveness;
 uniform float gloss;
 uniform float shadow;
-uniform float focal_distance;
 
 in vec3 xyz_coords;
 in vec3 v_normal;
@@ -4,10 +4,7 @@ layout (points) in;
 layout (triangle_strip, max_vertices = 4) out;
 
 // Needed for get_gl_Position
-uniform vec2 frame_shape;
-uniform float focal_distance;
-uniform float is_fixed_in_frame;
-uniform float anti_alias_width;
+#INSERT camera_uniform_declarations.glsl
 
 in vec3 v_point[1];
 in float v_radius[1];
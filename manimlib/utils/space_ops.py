@@ -101,7 +101,23 @@ def rotate_vector_2d(vector: Iterable, angle: float):
 
 
 def rotation_matrix_transpose_from_quaternion(quat: Iterable) -> np.ndarray:
-    return Rotation.from_quat(quat).as_matrix()
+    # Same as Rotation.from_quat(quat).as_matrix(), written out in closed form
+    # to skip the scipy round-trip; the camera calls this whenever its
+    # orientation changes.  The quaternion need not be unit length, as when
+    # it comes from interpolation, but like scipy a zero quaternion is an error.
+    x, y, z, w = quat
+    norm_sq = x * x + y * y + z * z + w * w
+    if norm_sq == 0:
+        raise ValueError("Found zero norm quaternion")
+    s = 2 / norm_sq
+    xx, yy, zz = s * x * x, s * y * y, s * z * z
+    xy, xz, yz = s * x * y, s * x * z, s * y * z
+    wx, wy, wz = s * w * x, s * w * y, s * w * z
+    return np.array([
+        [1 - yy - zz, xy - wz, xz + wy],
+        [xy + wz, 1 - xx - zz, yz - wx],
+        [xz - wy, yz + wx, 1 - xx - yy],
+    ])
 
 
 def rotation_matrix_from_quaternion(quat: Iterable) -> np.ndarray:
@@ -144,7 +160,7 @@ def angle_of_vector(vector: Sequence[float]) -> float:
     """
     Returns polar coordinate theta when vector is project on xy plane
     """
-    return np.angle(complex(*vector[:2]))
+    return math.atan2(vector[1], vector[0])
 
 
 def angle_between_vectors(v1: np.ndarray, v2: np.ndarray) -> float: